@@ -1,10 +1,50 @@
 import os
-from dotenv import load_dotenv
+import threading
 
-load_dotenv()
+# Settings are resolved on first access (see __getattr__ below) so importing
+# this module does not pay for locating and parsing a .env file.
+_INT_SETTINGS = {
+    "PROJECT_MAX_COUNT": 10,
+    "PROJECT_MAX_NAME_LEN": 30,
+    "PROJECT_MAX_DESCRIPTION_LEN": 150,
+    "TASK_MAX_COUNT": 20,
+    "TASK_MAX_NAME_LEN": 30,
+    "TASK_MAX_DESCRIPTION_LEN": 150,
+    "SYNC_PORT": 0,
+    "REMINDER_LEAD_HOURS": 24,
+}
 
-def get_int(key: str, default: int) -> int:
+_STR_SETTINGS = {
+    "REPLICA_ID": "",
+    "SYNC_HOST": "127.0.0.1",
+}
+
+_env_loaded = False
+_env_lock = threading.Lock()
+
+def _load_env() -> None:
+    global _env_loaded
+
+    with _env_lock:
+        if _env_loaded:
+            return
+
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _env_loaded = True
+
+def _getenv(key: str):
+    # load_dotenv() never overrides the environment, so .env is only read
+    # when a key is not already set there.
     val = os.getenv(key)
+    if val is None:
+        _load_env()
+        val = os.getenv(key)
+    return val
+
+def get_int(key: str, default: int) -> int:
+    val = _getenv(key)
 
     if val is None:
         return default
@@ -16,13 +56,16 @@ def get_int(key: str, default: int) -> int:
         return default
 
 def get_str(key: str, default: str) -> str:
-    return os.getenv(key, default)
-
-PROJECT_MAX_COUNT = get_int("PROJECT_MAX_COUNT", 10)
-PROJECT_MAX_NAME_LEN = get_int("PROJECT_MAX_NAME_LEN", 30)
-PROJECT_MAX_DESCRIPTION_LEN = get_int("PROJECT_MAX_DESCRIPTION_LEN", 150)
+    val = _getenv(key)
+    return default if val is None else val
 
-TASK_MAX_COUNT = get_int("TASK_MAX_COUNT", 20)
-TASK_MAX_NAME_LEN = get_int("TASK_MAX_NAME_LEN", 30)
-TASK_MAX_DESCRIPTION_LEN = get_int("TASK_MAX_DESCRIPTION_LEN", 150)
+def __getattr__(name: str):
+    if name in _INT_SETTINGS:
+        value = get_int(name, _INT_SETTINGS[name])
+    elif name in _STR_SETTINGS:
+        value = get_str(name, _STR_SETTINGS[name])
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
+    globals()[name] = value  # later lookups bypass __getattr__
+    return value
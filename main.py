@@ -1,8 +1,23 @@
-from project import Project, ProjectValidationError
+from __future__ import annotations
+
+import sys
+import threading
+from typing import TYPE_CHECKING, Optional
+
+import config
 from memory import MemoryStore
-from task import Task, TaskState, InvalidDeadlineError, TaskValidationError
-from config import PROJECT_MAX_COUNT, TASK_MAX_COUNT
 from utils import is_project_name_taken, is_task_name_taken
+from versioning import MODEL_LOCK, subscribe, unsubscribe
+
+# Model and sync modules are imported where they are first needed so the menu
+# appears without loading them (or reading .env) up front.
+if TYPE_CHECKING:
+    from project import Project
+    from task import Task
+    from sync import Replica
+
+_replica: Optional[Replica] = None
+_replica_lock = threading.Lock()
 
 def show_projects(store: MemoryStore):
     print("\n--- Projects in Memory ---")
@@ -17,9 +32,11 @@ def show_projects(store: MemoryStore):
     print("--------------------------\n")
 
 def create_project_interactively(store: MemoryStore):
+    from project import Project, ProjectValidationError
+
     projects = store.list_projects()
-    if len(projects) >= PROJECT_MAX_COUNT:
-        print(f"Cannot create more projects. Maximum limit of {PROJECT_MAX_COUNT} reached.\n")
+    if len(projects) >= config.PROJECT_MAX_COUNT:
+        print(f"Cannot create more projects. Maximum limit of {config.PROJECT_MAX_COUNT} reached.\n")
         return
 
     name = input("Enter project name: ").strip()
@@ -31,7 +48,8 @@ def create_project_interactively(store: MemoryStore):
 
     try:
         project = Project(name, desc)
-        store.add_project(project)
+        with MODEL_LOCK:
+            store.add_project(project)
         print(f"Project '{project.name}' created successfully.\n")
 
     except ProjectValidationError as e:
@@ -89,6 +107,8 @@ def project_submenu(project, store: MemoryStore):
             print("Invalid option, try again.\n")
 
 def edit_project(project, store: MemoryStore):
+    from project import ProjectValidationError
+
     print(f"\n--- Editing Project: {project.name} ---")
     print("Leave fields empty to keep current values.")
 
@@ -100,13 +120,14 @@ def edit_project(project, store: MemoryStore):
     new_desc = input(f"New description: ").strip()
 
     try:
-        if new_name:
-            project.update_name(new_name)
+        with MODEL_LOCK:
+            if new_name:
+                project.update_name(new_name)
 
-        if new_desc:
-            project.update_description(new_desc)
-        elif new_desc == "":
-            project.update_description(None)
+            if new_desc:
+                project.update_description(new_desc)
+            elif new_desc == "":
+                project.update_description(None)
 
         print("Project updated successfully.\n")
 
@@ -127,7 +148,8 @@ def delete_project_interactively(store: MemoryStore):
 
     confirm = input(f"Are you sure you want to delete project '{project.name}' and all its tasks? (Y/N): ").strip().lower()
     if confirm == "y":
-        store.remove_project(pid)
+        with MODEL_LOCK:
+            store.remove_project(pid)
         print(f"Project '{project.name}' and all its tasks have been deleted.\n")
     else:
         print("Deletion cancelled.\n")
@@ -185,7 +207,8 @@ def manage_tasks_menu(project):
             elif action == "2":
                 confirm = input(f"Are you sure you want to delete task '{task.name}'? (Y/N): ").strip().lower()
                 if confirm == "y":
-                    project.remove_task(task.id)
+                    with MODEL_LOCK:
+                        project.remove_task(task.id)
                     print(f"Task '{task.name}' deleted.\n")
 
                     if not project.tasks:
@@ -201,6 +224,8 @@ def manage_tasks_menu(project):
                 print("Invalid option.\n")
 
 def edit_task(task: Task, project: Project):
+    from task import TaskState, InvalidDeadlineError
+
     print(f"\n--- Editing Task: {task.name} ---")
     print("Leave a field empty to keep the current value.")
 
@@ -217,34 +242,37 @@ def edit_task(task: Task, project: Project):
     print(f"Current deadline: {task.deadline or '(none)'}")
     new_deadline = input("New deadline (YYYY-MM-DD) or leave empty to keep/remove: ").strip()
 
-    if name:
-        task.name = name
-    if new_desc:
-        task.description = new_desc
-    elif new_desc == "":
-        task.description = None
-
-    if state_choice == "1":
-        task.state = TaskState.TODO
-    elif state_choice == "2":
-        task.state = TaskState.DOING
-    elif state_choice == "3":
-        task.state = TaskState.DONE
-
-    try:
-        if new_deadline:
-            task.update_deadline(new_deadline)
-        elif new_deadline == "":
-            task.update_deadline(None)
-    except InvalidDeadlineError as e:
-        print(f"Error updating deadline: {e}\n")
-        return
+    with MODEL_LOCK:
+        if name:
+            task.name = name
+        if new_desc:
+            task.description = new_desc
+        elif new_desc == "":
+            task.description = None
+
+        if state_choice == "1":
+            task.state = TaskState.TODO
+        elif state_choice == "2":
+            task.state = TaskState.DOING
+        elif state_choice == "3":
+            task.state = TaskState.DONE
+
+        try:
+            if new_deadline:
+                task.update_deadline(new_deadline)
+            elif new_deadline == "":
+                task.update_deadline(None)
+        except InvalidDeadlineError as e:
+            print(f"Error updating deadline: {e}\n")
+            return
 
     print("Task updated successfully.\n")
 
 def add_task_to_project(project):
-    if len(project.tasks) >= TASK_MAX_COUNT:
-        print(f"Cannot add more tasks. Maximum of {TASK_MAX_COUNT} tasks per project reached.\n")
+    from task import Task, InvalidDeadlineError, TaskValidationError
+
+    if len(project.tasks) >= config.TASK_MAX_COUNT:
+        print(f"Cannot add more tasks. Maximum of {config.TASK_MAX_COUNT} tasks per project reached.\n")
         return
 
     name = input("Enter task name: ").strip()
@@ -256,14 +284,81 @@ def add_task_to_project(project):
 
     try:
         task = Task(name=name, description=desc, deadline=deadline if deadline else None)
-        project.add_task(task)
+        with MODEL_LOCK:
+            project.add_task(task)
         print(f"Task '{task.name}' added to project '{project.name}'.\n")
     except (TaskValidationError, InvalidDeadlineError) as e:
         print(f"Error creating task: {e}\n")
 
+def get_replica(store: MemoryStore) -> Replica:
+    global _replica
+    from sync import Replica
+
+    with _replica_lock:
+        if _replica is None:
+            _replica = Replica(store)
+        return _replica
+
+def start_sync_listener(store: MemoryStore):
+    from sync import serve
+
+    replica = get_replica(store)
+    try:
+        server = serve(replica, config.SYNC_HOST, config.SYNC_PORT)
+    except OSError as e:
+        print(f"Error starting sync listener on {config.SYNC_HOST}:{config.SYNC_PORT}: {e}\n")
+        return
+
+    host, port = server.server_address[:2]
+    print(f"Accepting sync requests on {host}:{port} (replica {replica.replica_id}).\n")
+
+def sync_interactively(store: MemoryStore):
+    from sync import SyncError, sync_with
+
+    replica = get_replica(store)
+    peer = input("Enter peer address (host:port): ").strip()
+    host, _, port = peer.rpartition(":")
+
+    if not port.isdigit():
+        print("Address must look like host:port.\n")
+        return
+
+    try:
+        sent, received, changes = sync_with(replica, host or "127.0.0.1", int(port))
+        print(f"Sync complete: {changes} change(s) applied, {sent} bytes sent, {received} bytes received.\n")
+    except SyncError as e:
+        print(f"Error syncing: {e}\n")
+
+def print_reminder(task: Task, kind: str, deadline: str):
+    from reminders import OVERDUE
+
+    if kind == OVERDUE:
+        print(f"\n[Reminder] Task '{task.name}' is overdue (deadline: {deadline[:10]}).")
+    else:
+        print(f"\n[Reminder] Task '{task.name}' is due soon (deadline: {deadline[:10]}).")
+
+def start_reminders_on_first_task(obj, event: str, value):
+    # The scheduler has nothing to do until a task exists, so it is only
+    # imported and started then.
+    if event != "task_added":
+        return
+
+    from reminders import ReminderScheduler
+
+    unsubscribe(start_reminders_on_first_task)
+    scheduler = ReminderScheduler(print_reminder)
+    scheduler.start()
+    scheduler.schedule(value)
+
 
 def main():
     store = MemoryStore()
+    subscribe(start_reminders_on_first_task)
+
+    # Config (and .env) is only read for the listener when asked for, so a
+    # plain run reaches the first prompt without loading it.
+    if "--listen" in sys.argv[1:]:
+        start_sync_listener(store)
 
     while True:
         print("=== Project Menu ===")
@@ -271,7 +366,8 @@ def main():
         print("2. Create new project")
         print("3. Select a project")
         print("4. Delete a project")
-        print("5. Quit")
+        print("5. Sync with a peer")
+        print("6. Quit")
 
         choice = input("Select an option: ").strip()
         if choice == "1":
@@ -285,6 +381,8 @@ def main():
         elif choice == "4":
             delete_project_interactively(store)
         elif choice == "5":
+            sync_interactively(store)
+        elif choice == "6":
             print("Goodbye!")
             break
         else:
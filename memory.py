@@ -1,10 +1,16 @@
-from typing import List, Optional
-from project import Project
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+from versioning import CLOCK, Stamp, notify
+
+if TYPE_CHECKING:
+    from project import Project
 
 
 class MemoryStore:
     def __init__(self) -> None:
         self._projects: List[Project] = []
+        self.removed_projects: Dict[str, Stamp] = {}
 
     def add_project(self, project: Project) -> None:
         self._projects.append(project)
@@ -18,9 +24,22 @@ class MemoryStore:
                 return p
         return None
 
-    def remove_project(self, project_id: str) -> bool:
+    def remove_project(self, project_id: str, stamp: Optional[Stamp] = None) -> bool:
+        """Removes a project and records a tombstone; sync passes the remote stamp."""
+        removed = None
         for i, p in enumerate(self._projects):
             if p.id == project_id:
-                del self._projects[i]
-                return True
-        return False
+                removed = self._projects.pop(i)
+                break
+
+        # An unknown id only leaves a tombstone when a peer reported the removal.
+        if removed is None and stamp is None:
+            return False
+
+        stamp = stamp or CLOCK.tick()
+        self.removed_projects[project_id] = max(stamp, self.removed_projects.get(project_id, stamp))
+
+        if removed is None:
+            return False
+        notify(removed, "project_removed", removed)
+        return True
@@ -1,12 +1,10 @@
 from __future__ import annotations
 
-import textwrap
-from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
-import uuid
 import config
 from task import Task
+from versioning import CLOCK, Stamp, Versioned, item_hash, notify
 
 
 class ProjectValidationError(ValueError):
@@ -52,7 +50,9 @@ def _format_created_at(iso_str: str) -> str:
 
     return dt_utc.strftime("%b %d, %Y %H:%M:%S UTC")
 
-class Project:
+class Project(Versioned):
+    _versioned_fields = ("name", "description")
+
     name: str
     description: Optional[str]
     tasks: List["Task"]
@@ -79,7 +79,10 @@ class Project:
         self.name = name
         self.description = description
         self.tasks = []
+        self.removed_tasks: Dict[str, Stamp] = {}
         self.created_at = _now_iso()
+
+        import uuid
         self.id = str(uuid.uuid4())
 
     def view(self) -> Dict[str, Any]:
@@ -111,6 +114,8 @@ class Project:
         self.description = new_desc
 
     def pretty(self, width: int = 72) -> str:
+        import textwrap
+
         header = f"Project: {self.name}  (id: {self.id})"
         created = f"Created: {_format_created_at(self.created_at)}"
         task_count = f"Tasks: {len(self.tasks)}"
@@ -146,6 +151,8 @@ class Project:
         return "\n".join(lines)
 
     def to_dict(self) -> Dict[str, Any]:
+        from dataclasses import asdict
+
         return {
             "id": self.id,
             "name": self.name,
@@ -156,6 +163,8 @@ class Project:
 
     def add_task(self, task: Task) -> None:
         self.tasks.append(task)
+        self.attach(task)
+        notify(self, "task_added", task)
 
     def list_tasks(self) -> list[Task]:
         return list(self.tasks)
@@ -166,15 +175,36 @@ class Project:
                 return t
         return None
 
-    def remove_task(self, task_id: str) -> bool:
+    def remove_task(self, task_id: str, stamp: Optional[Stamp] = None) -> bool:
+        """Removes a task and records a tombstone; sync passes the remote stamp."""
         for i, t in enumerate(self.tasks):
             if t.id == task_id:
                 del self.tasks[i]
+                self.detach(t)
+                self.record_removal(task_id, stamp or CLOCK.tick())
+                notify(self, "task_removed", t)
                 return True
+
+        if stamp is not None:
+            self.record_removal(task_id, stamp)
         return False
 
+    def record_removal(self, task_id: str, stamp: Stamp) -> None:
+        """Keeps the highest tombstone stamp seen for a removed task."""
+        old = self.removed_tasks.get(task_id)
+        if old is not None and old >= stamp:
+            return
+
+        self.removed_tasks[task_id] = stamp
+        delta = item_hash("removed", task_id, *stamp)
+        if old is not None:
+            delta ^= item_hash("removed", task_id, *old)
+        self.xor_digest(delta)
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any], task_factory: Optional[callable] = None) -> "Project":
+        import uuid
+
         proj = cls(
             name=data["name"],
             description=data.get("description", ""),
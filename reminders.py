@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+import config
+from versioning import subscribe, unsubscribe
+
+if TYPE_CHECKING:
+    from task import Task
+
+UPCOMING = "upcoming"
+OVERDUE = "overdue"
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _deadline_end(task: Task) -> Optional[datetime]:
+    """A task is due by the end of its deadline day."""
+    from task import TaskState
+
+    if not task.deadline or task.state == TaskState.DONE:
+        return None
+    try:
+        dt = datetime.fromisoformat(task.deadline)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt + timedelta(days=1)
+
+
+class ReminderScheduler:
+    """Fires callback(task, kind, deadline) when a task's deadline is near or has passed.
+
+    deadline is the value the reminder was scheduled for, so the callback does
+    not have to re-read a task that may have changed since.
+
+    Pending reminders live in a heap ordered by fire time. Rescheduling a task
+    marks its old entries dead and pushes new ones, so a deadline or state
+    change costs O(log n) and the heap is never rescanned as a whole.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[Task, str, str], None],
+        lead: Optional[timedelta] = None,
+        now: Callable[[], datetime] = _utc_now,
+    ) -> None:
+        self.callback = callback
+        self._lead = lead
+        self.now = now
+        self._heap: List[List[Any]] = []
+        self._entries: Dict[str, List[List[Any]]] = {}
+        self._tracked: Dict[str, Task] = {}
+        self._dead = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition(threading.RLock())
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    @property
+    def lead(self) -> timedelta:
+        if self._lead is None:
+            self._lead = timedelta(hours=config.REMINDER_LEAD_HOURS)
+        return self._lead
+
+    def start(self, background: bool = True) -> None:
+        """Follows task changes; without a background thread the caller drives run_pending()."""
+        subscribe(self._on_event)
+        self._stopped = False
+        if background:
+            self._thread = threading.Thread(target=self._run, name="reminders", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        unsubscribe(self._on_event)
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap) - self._dead
+
+    def heap_size(self) -> int:
+        """Entries in the heap, counting cancelled ones not yet compacted away."""
+        with self._cond:
+            return len(self._heap)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def schedule(self, task: Task) -> None:
+        with self._cond:
+            self._tracked[task.id] = task
+            self._drop_entries(task.id)
+
+            end = _deadline_end(task)
+            if end is None:
+                return
+
+            entries = [self._push(end, OVERDUE, task)]
+            if self.now() < end:
+                entries.append(self._push(end - self.lead, UPCOMING, task))
+            self._entries[task.id] = entries
+            self._cond.notify()
+
+    def cancel(self, task_id: str) -> None:
+        with self._cond:
+            self._tracked.pop(task_id, None)
+            self._drop_entries(task_id)
+
+    def run_pending(self) -> int:
+        """Fires every reminder that is due now; returns how many fired."""
+        with self._cond:
+            due = self._pop_due()
+        for task, kind, deadline in due:
+            try:
+                self.callback(task, kind, deadline)
+            except Exception:
+                import logging
+
+                logging.getLogger(__name__).exception("Reminder callback failed for task %s.", task.id)
+        return len(due)
+
+    def _push(self, when: datetime, kind: str, task: Task) -> List[Any]:
+        entry = [when, next(self._seq), kind, task, True, task.deadline]
+        heapq.heappush(self._heap, entry)
+        return entry
+
+    def _drop_entries(self, task_id: str) -> None:
+        for entry in self._entries.pop(task_id, []):
+            if entry[4]:
+                entry[4] = False
+                self._dead += 1
+
+        # Rebuild once dead entries dominate so memory stays proportional to live reminders.
+        if self._dead > 64 and self._dead * 2 > len(self._heap):
+            self._heap = [e for e in self._heap if e[4]]
+            heapq.heapify(self._heap)
+            self._dead = 0
+
+    def _discard_dead_head(self) -> None:
+        while self._heap and not self._heap[0][4]:
+            heapq.heappop(self._heap)
+            self._dead -= 1
+
+    def _pop_due(self) -> List[tuple]:
+        due = []
+        now = self.now()
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not entry[4]:
+                self._dead -= 1
+                continue
+
+            _, _, kind, task, _, deadline = entry
+            remaining = [e for e in self._entries.pop(task.id, []) if e is not entry]
+            if remaining:
+                self._entries[task.id] = remaining
+
+            # The overdue reminder supersedes an upcoming one that was missed.
+            if kind == UPCOMING and any(e[2] == OVERDUE and e[0] <= now for e in remaining):
+                continue
+            due.append((task, kind, deadline))
+        return due
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    self._discard_dead_head()
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = (self._heap[0][0] - self.now()).total_seconds()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                if self._stopped:
+                    return
+            self.run_pending()
+
+    def _on_event(self, obj: Any, event: str, value: Any) -> None:
+        if event == "task_added":
+            self.schedule(value)
+        elif event == "task_removed":
+            self.cancel(value.id)
+        elif event == "project_removed":
+            for task in value.tasks:
+                self.cancel(task.id)
+        elif event in ("deadline", "state") and getattr(obj, "id", None) in self._tracked:
+            self.schedule(obj)
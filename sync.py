@@ -0,0 +1,433 @@
+from __future__ import annotations
+
+import json
+import logging
+import socket
+import socketserver
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import config
+from memory import MemoryStore
+from project import Project
+from task import Task, TaskState
+from versioning import CLOCK, MODEL_LOCK, LamportClock, Stamp, Versioned
+
+logger = logging.getLogger(__name__)
+
+_ZERO_STAMP: Stamp = (0, "")
+
+
+class SyncError(Exception):
+    pass
+
+
+_TEXT_LIMITS = {
+    Project: {"name": "PROJECT_MAX_NAME_LEN", "description": "PROJECT_MAX_DESCRIPTION_LEN"},
+    Task: {"name": "TASK_MAX_NAME_LEN", "description": "TASK_MAX_DESCRIPTION_LEN"},
+}
+
+# A parsed field is (decoded value, stamp).
+Field = Tuple[Any, Stamp]
+
+
+def _encode(value: Any) -> Any:
+    return value.value if isinstance(value, TaskState) else value
+
+def _parse_stamp(raw: Any) -> Stamp:
+    if (
+        not isinstance(raw, (list, tuple)) or len(raw) != 2
+        or type(raw[0]) is not int or raw[0] < 0 or not isinstance(raw[1], str)
+    ):
+        raise SyncError(f"Malformed stamp {raw!r}.")
+    return raw[0], raw[1]
+
+def _parse_value(cls: type, name: str, value: Any) -> Any:
+    """Applies the same rules a local edit would; returns the decoded value."""
+    if name not in cls._versioned_fields:
+        raise SyncError(f"{cls.__name__} has no versioned field {name!r}.")
+
+    if name == "state":
+        if value not in {state.value for state in TaskState}:
+            raise SyncError(f"Invalid task state {value!r}.")
+        return TaskState(value)
+
+    if name == "deadline":
+        if value is None:
+            return None
+        try:
+            datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise SyncError(f"Invalid deadline {value!r}.") from None
+        return value
+
+    if name == "description" and value is None:
+        return None
+    if not isinstance(value, str):
+        raise SyncError(f"{cls.__name__} {name} must be text, got {type(value).__name__}.")
+    if name == "name" and not value.strip():
+        raise SyncError(f"{cls.__name__} name cannot be empty.")
+
+    limit = getattr(config, _TEXT_LIMITS[cls][name])
+    if len(value) > limit:
+        raise SyncError(f"{cls.__name__} {name} must be at most {limit} characters.")
+    return value
+
+def _parse_fields(cls: type, raw: Any) -> Dict[str, Field]:
+    if not isinstance(raw, dict):
+        raise SyncError("Malformed fields.")
+
+    fields = {}
+    for name, item in raw.items():
+        if not isinstance(item, list) or len(item) != 3:
+            raise SyncError(f"Malformed field {name!r}.")
+        value, counter, replica = item
+        fields[name] = (_parse_value(cls, name, value), _parse_stamp([counter, replica]))
+    return fields
+
+def _parse_tombstones(raw: Any) -> Dict[str, Stamp]:
+    if not isinstance(raw, dict):
+        raise SyncError("Malformed tombstones.")
+    return {str(obj_id): _parse_stamp(stamp) for obj_id, stamp in raw.items()}
+
+def _parse_entry(cls: type, raw: Any) -> Dict[str, Any]:
+    if not isinstance(raw, dict) or not isinstance(raw.get("id"), str) or not isinstance(raw.get("created_at"), str):
+        raise SyncError(f"Malformed {cls.__name__.lower()} entry.")
+    return {"id": raw["id"], "created_at": raw["created_at"], "fields": _parse_fields(cls, raw.get("fields", {}))}
+
+def _parse_delta(delta: Any) -> Dict[str, Any]:
+    """Validates a peer's delta into plain data; raises SyncError before anything is changed."""
+    if not isinstance(delta, dict):
+        raise SyncError("Malformed delta.")
+
+    vv = delta.get("vv", {})
+    if not isinstance(vv, dict) or not all(type(c) is int and c >= 0 for c in vv.values()):
+        raise SyncError("Malformed version vector.")
+
+    raw_projects = delta.get("projects", [])
+    if not isinstance(raw_projects, list):
+        raise SyncError("Malformed project list.")
+
+    projects = []
+    for raw in raw_projects:
+        p_entry = _parse_entry(Project, raw)
+        raw_tasks = raw.get("tasks", [])
+        if not isinstance(raw_tasks, list):
+            raise SyncError("Malformed task list.")
+        p_entry["tasks"] = [_parse_entry(Task, t) for t in raw_tasks]
+        p_entry["removed_tasks"] = _parse_tombstones(raw.get("removed_tasks", {}))
+        projects.append(p_entry)
+
+    return {
+        "vv": {str(replica): counter for replica, counter in vv.items()},
+        "projects": projects,
+        "removed_projects": _parse_tombstones(delta.get("removed_projects", {})),
+    }
+
+def project_digest(project: Project) -> str:
+    """Equal digests mean the replicas hold the same project.
+
+    The digest is maintained incrementally by Versioned, so this is O(1).
+    """
+    return format(project.digest(), "016x")
+
+def _blank(cls: type, obj_id: str, created_at: str, defaults: Dict[str, Any]) -> Any:
+    # Objects arriving from a peer were validated where they were created,
+    # so they are rebuilt without running the constructor's checks.
+    obj = cls.__new__(cls)
+    for name, value in defaults.items():
+        object.__setattr__(obj, name, value)
+    object.__setattr__(obj, "id", obj_id)
+    object.__setattr__(obj, "created_at", created_at)
+    return obj
+
+def _dedupe_names(items: List[Any], max_len: int, kind: str) -> None:
+    """Renames all but the oldest of each group of same-named items.
+
+    The oldest item (by created_at, then id) keeps the name; the others get
+    " (2)", " (3)", ... Every replica holding the same items picks the same
+    names, so the renames converge like any other edit.
+    """
+    by_name: Dict[str, List[Any]] = {}
+    for item in items:
+        by_name.setdefault(item.name, []).append(item)
+    taken = set(by_name)
+
+    for name in sorted(by_name):
+        group = by_name[name]
+        if len(group) < 2:
+            continue
+
+        group.sort(key=lambda o: (o.created_at, o.id))
+        for item in group[1:]:
+            k = 2
+            while True:
+                suffix = f" ({k})"
+                candidate = name[:max_len - len(suffix)] + suffix
+                if candidate not in taken:
+                    break
+                k += 1
+            taken.add(candidate)
+            logger.warning("Renamed %s %r (id %s) to %r after sync: name already taken.", kind, name, item.id, candidate)
+            item.name = candidate
+
+def _merge_fields(obj: Versioned, fields: Dict[str, Field]) -> int:
+    """Last-writer-wins per field; returns the number of fields that changed."""
+    local = obj.stamps()
+    changed = 0
+    for name, (value, stamp) in fields.items():
+        if stamp > local.get(name, _ZERO_STAMP):
+            obj.set_stamped(name, value, stamp)
+            changed += 1
+    return changed
+
+
+class Replica:
+    """Exchanges deltas of a MemoryStore with other replicas.
+
+    Every versioned field carries a Lamport stamp. A peer advertises a version
+    vector (highest counter seen per replica) and a digest per project; the
+    delta contains only projects whose digest differs and, inside them, only
+    stamps the peer has not seen yet.
+
+    Merges never drop another replica's data. Names that collide after a
+    merge are made unique by renaming (see _dedupe_names), and
+    PROJECT_MAX_COUNT / TASK_MAX_COUNT only limit what is created locally:
+    a merge that goes over them is kept and logged as a warning.
+    """
+
+    def __init__(self, store: MemoryStore, clock: LamportClock = CLOCK) -> None:
+        self.store = store
+        self.clock = clock
+        self.seen: Dict[str, int] = {}
+        self._lock = MODEL_LOCK
+
+    @property
+    def replica_id(self) -> str:
+        return self.clock.replica_id
+
+    def version_vector(self) -> Dict[str, int]:
+        vv = dict(self.seen)
+        vv[self.replica_id] = self.clock.counter
+        return vv
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "replica": self.replica_id,
+                "vv": self.version_vector(),
+                "digests": {p.id: project_digest(p) for p in self.store.list_projects()},
+            }
+
+    def delta_for(self, summary: Dict[str, Any]) -> Dict[str, Any]:
+        peer_vv: Dict[str, int] = summary.get("vv", {})
+        peer_digests: Dict[str, str] = summary.get("digests", {})
+
+        def unseen(stamp: Stamp) -> bool:
+            return stamp[0] > peer_vv.get(stamp[1], 0)
+
+        def entry(obj: Versioned) -> Dict[str, Any]:
+            fields = {
+                name: [_encode(getattr(obj, name)), stamp[0], stamp[1]]
+                for name, stamp in obj.stamps().items()
+                if unseen(stamp)
+            }
+            return {"id": obj.id, "created_at": obj.created_at, "fields": fields}
+
+        with self._lock:
+            # Snapshot the vector first: edits made while scanning are resent next time.
+            vv = self.version_vector()
+            projects = []
+            for project in self.store.list_projects():
+                if peer_digests.get(project.id) == project_digest(project):
+                    continue
+                p_entry = entry(project)
+                p_entry["tasks"] = [e for e in map(entry, project.tasks) if e["fields"]]
+                p_entry["removed_tasks"] = {
+                    tid: list(stamp) for tid, stamp in project.removed_tasks.items() if unseen(stamp)
+                }
+                if p_entry["fields"] or p_entry["tasks"] or p_entry["removed_tasks"]:
+                    projects.append(p_entry)
+
+            return {
+                "replica": self.replica_id,
+                "vv": vv,
+                "projects": projects,
+                "removed_projects": {
+                    pid: list(stamp) for pid, stamp in self.store.removed_projects.items() if unseen(stamp)
+                },
+            }
+
+    def apply(self, delta: Dict[str, Any]) -> int:
+        """Merges a peer's delta and returns the number of changes applied.
+
+        The delta is validated in full first; a rejected delta raises
+        SyncError and leaves the store untouched.
+        """
+        parsed = _parse_delta(delta)
+        changes = 0
+        with self._lock:
+            removed_projects = self.store.removed_projects
+            local = self._check_new_objects(parsed)
+
+            for pid, stamp in parsed["removed_projects"].items():
+                if self.store.remove_project(pid, stamp=stamp):
+                    changes += 1
+
+            touched: List[Project] = []
+            for p_entry in parsed["projects"]:
+                pid = p_entry["id"]
+                if pid in removed_projects:
+                    continue
+
+                project, tasks_by_id = local[pid]
+                if project is None:
+                    project = _blank(Project, pid, p_entry["created_at"], {
+                        "name": "", "description": "", "tasks": [], "removed_tasks": {},
+                    })
+                    self.store.add_project(project)
+                    local[pid] = (project, tasks_by_id)
+                changes += _merge_fields(project, p_entry["fields"])
+                touched.append(project)
+
+                for tid, stamp in p_entry["removed_tasks"].items():
+                    if project.remove_task(tid, stamp=stamp):
+                        tasks_by_id.pop(tid, None)
+                        changes += 1
+
+                for t_entry in p_entry["tasks"]:
+                    tid = t_entry["id"]
+                    if tid in project.removed_tasks:
+                        continue
+                    task = tasks_by_id.get(tid)
+                    if task is None:
+                        task = _blank(Task, tid, t_entry["created_at"], {
+                            "name": "", "description": "", "state": TaskState.TODO, "deadline": None,
+                        })
+                        project.add_task(task)
+                        tasks_by_id[tid] = task
+                    changes += _merge_fields(task, t_entry["fields"])
+
+            for replica, counter in parsed["vv"].items():
+                if replica != self.replica_id and counter > self.seen.get(replica, 0):
+                    self.seen[replica] = counter
+                self.clock.observe(counter)
+
+            # Renames happen after observing the peer's clock so they win over the merged names.
+            if touched:
+                projects = self.store.list_projects()
+                _dedupe_names(projects, config.PROJECT_MAX_NAME_LEN, "project")
+                if len(projects) > config.PROJECT_MAX_COUNT:
+                    logger.warning("Sync left %d projects; the limit is %d.", len(projects), config.PROJECT_MAX_COUNT)
+
+            for project in touched:
+                _dedupe_names(project.tasks, config.TASK_MAX_NAME_LEN, "task")
+                if len(project.tasks) > config.TASK_MAX_COUNT:
+                    logger.warning(
+                        "Sync left %d tasks in project %r; the limit is %d.",
+                        len(project.tasks), project.name, config.TASK_MAX_COUNT,
+                    )
+
+        return changes
+
+    def _check_new_objects(self, parsed: Dict[str, Any]) -> Dict[str, Tuple[Optional[Project], Dict[str, Task]]]:
+        """Rejects projects or tasks that would be created without a name.
+
+        Returns the local project (or None) and its tasks by id for every
+        project in the delta, for apply() to reuse.
+        """
+        local = {}
+        for p_entry in parsed["projects"]:
+            pid = p_entry["id"]
+            project = self.store.get_project(pid)
+            tasks_by_id = {t.id: t for t in project.tasks} if project else {}
+            local[pid] = (project, tasks_by_id)
+
+            if pid in self.store.removed_projects or pid in parsed["removed_projects"]:
+                continue
+            if project is None and "name" not in p_entry["fields"]:
+                raise SyncError(f"New project {pid} arrived without a name.")
+
+            removed = project.removed_tasks if project else {}
+            for t_entry in p_entry["tasks"]:
+                tid = t_entry["id"]
+                if tid in tasks_by_id or tid in removed or tid in p_entry["removed_tasks"]:
+                    continue
+                if "name" not in t_entry["fields"]:
+                    raise SyncError(f"New task {tid} arrived without a name.")
+        return local
+
+
+def _send(sock_file, message: Dict[str, Any]) -> int:
+    data = json.dumps(message, separators=(",", ":")).encode() + b"\n"
+    sock_file.write(data)
+    sock_file.flush()
+    return len(data)
+
+def _recv(sock_file) -> Tuple[Dict[str, Any], int]:
+    data = sock_file.readline()
+    if not data:
+        raise SyncError("Peer closed the connection before the sync finished.")
+
+    message = json.loads(data)
+    if not isinstance(message, dict):
+        raise SyncError("Peer sent a malformed message.")
+    if message.get("ok") is False:
+        raise SyncError(f"Peer rejected the sync: {message.get('error', 'unknown error')}")
+    return message, len(data)
+
+def sync_with(replica: Replica, host: str, port: int, timeout: float = 30.0) -> Tuple[int, int, int]:
+    """Runs one sync session against a peer started with serve().
+
+    Returns (bytes sent, bytes received, changes applied locally).
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock, sock.makefile("rwb") as f:
+            sent = _send(f, {"summary": replica.summary()})
+            reply, received = _recv(f)
+            changes = replica.apply(reply["delta"])
+            sent += _send(f, {"delta": replica.delta_for(reply["summary"])})
+            _recv(f)  # acknowledgement
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise SyncError(f"Sync with {host}:{port} failed: {e}") from e
+    return sent, received, changes
+
+
+class _SyncHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        replica: Replica = self.server.replica
+        try:
+            request, _ = _recv(self.rfile)
+            _send(self.wfile, {"delta": replica.delta_for(request["summary"]), "summary": replica.summary()})
+            request, _ = _recv(self.rfile)
+            changes = replica.apply(request["delta"])
+            _send(self.wfile, {"ok": True})
+        except (SyncError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning("Rejected sync from %s: %s", self.client_address[0], e)
+            try:
+                _send(self.wfile, {"ok": False, "error": str(e)})
+            except OSError:
+                pass
+            return
+        except OSError as e:
+            logger.warning("Sync with %s was interrupted: %s", self.client_address[0], e)
+            return
+
+        if self.server.on_sync:
+            self.server.on_sync(changes)
+
+
+def serve(
+    replica: Replica,
+    host: str,
+    port: int,
+    on_sync: Optional[Callable[[int], None]] = None,
+) -> socketserver.ThreadingTCPServer:
+    """Accepts sync sessions in a background thread; call shutdown() to stop."""
+    server = socketserver.ThreadingTCPServer((host, port), _SyncHandler)
+    server.daemon_threads = True
+    server.replica = replica
+    server.on_sync = on_sync
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
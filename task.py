@@ -3,10 +3,9 @@ from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone, date
 from enum import Enum
 from typing import Optional, Dict, Any
-import uuid
-import textwrap
 
-from config import TASK_MAX_NAME_LEN, TASK_MAX_DESCRIPTION_LEN
+import config
+from versioning import Versioned
 
 class TaskValidationError(ValueError):
     pass
@@ -72,7 +71,9 @@ def _format_deadline(iso_str: Optional[str]) -> str:
         return iso_str
 
 @dataclass(init=False)
-class Task:
+class Task(Versioned):
+    _versioned_fields = ("name", "description", "state", "deadline")
+
     name: str
     description: Optional[str]
     state: TaskState
@@ -91,16 +92,18 @@ class Task:
         if not name:
             raise TaskNameRequiredError("Task name cannot be empty.")
 
-        if len(name) > TASK_MAX_NAME_LEN:
-            raise TaskNameTooLongError(f"Task name must be at most {TASK_MAX_NAME_LEN} characters.")
+        if len(name) > config.TASK_MAX_NAME_LEN:
+            raise TaskNameTooLongError(f"Task name must be at most {config.TASK_MAX_NAME_LEN} characters.")
 
-        if len(description) > TASK_MAX_DESCRIPTION_LEN:
-            raise TaskDescriptionTooLongError(f"Task description must be at most {TASK_MAX_DESCRIPTION_LEN} characters.")
+        if len(description) > config.TASK_MAX_DESCRIPTION_LEN:
+            raise TaskDescriptionTooLongError(f"Task description must be at most {config.TASK_MAX_DESCRIPTION_LEN} characters.")
 
         self.name = name
         self.description = description
         self.state = TaskState.TODO
         self.created_at = _now_iso()
+
+        import uuid
         self.id = str(uuid.uuid4())
 
         if deadline:
@@ -135,6 +138,8 @@ class Task:
         }
 
     def pretty(self, width: int = 72) -> str:
+        import textwrap
+
         desc = self.description or "(none)"
         wrapped_desc = textwrap.fill(desc, width=width, subsequent_indent="  ")
         return (
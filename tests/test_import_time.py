@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must not load before the first prompt of a plain run.
+DEFERRED_MODULES = {"project", "task", "sync", "reminders", "dotenv", "textwrap", "datetime"}
+
+# `import main` may take at most this many times as long as `import typing`
+# measured in the same run (~1.7x lazily; loading everything eagerly was ~6x).
+IMPORT_BUDGET_RATIO = 3
+
+
+def _import_times(*args: str, stdin: str = "") -> dict:
+    env = {k: v for k, v in os.environ.items() if k not in ("SYNC_PORT", "SYNC_HOST", "REPLICA_ID")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT, input=stdin, env=env, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_first_prompt_loads_no_deferred_modules(self):
+        loaded = DEFERRED_MODULES & set(_import_times("main.py", stdin="6\n"))
+        self.assertEqual(loaded, set())
+
+    def test_import_main_loads_no_deferred_modules(self):
+        loaded = DEFERRED_MODULES & set(_import_times("-c", "import main"))
+        self.assertEqual(loaded, set())
+
+    def test_main_import_stays_within_budget(self):
+        # Best of a few runs keeps a busy machine from failing the test.
+        main = min(_import_times("-c", "import main")["main"] for _ in range(3))
+        baseline = min(_import_times("-c", "import typing")["typing"] for _ in range(3))
+        self.assertLess(main, IMPORT_BUDGET_RATIO * baseline)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import threading
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+from memory import MemoryStore
+from project import Project
+from reminders import OVERDUE, UPCOMING, ReminderScheduler
+from task import Task, TaskState
+
+TODAY = datetime.combine(date.today(), datetime.min.time()).replace(tzinfo=timezone.utc)
+
+
+def _deadline(days: int) -> str:
+    return (date.today() + timedelta(days=days)).isoformat()
+
+
+class ReminderSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = TODAY
+        self.fired = []
+        self.scheduler = ReminderScheduler(
+            lambda task, kind, deadline: self.fired.append((task.name, kind, deadline[:10])),
+            lead=timedelta(hours=24),
+            now=lambda: self.clock,
+        )
+        self.scheduler.start(background=False)
+        self.project = Project("Work")
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def advance_to(self, days: int) -> None:
+        self.clock = TODAY + timedelta(days=days)
+        self.scheduler.run_pending()
+
+    def test_upcoming_then_overdue(self):
+        self.project.add_task(Task("report", deadline=_deadline(3)))
+        self.assertEqual(self.scheduler.pending(), 2)
+
+        self.advance_to(2)
+        self.assertEqual(self.fired, [])
+
+        self.advance_to(3)
+        self.assertEqual(self.fired, [("report", UPCOMING, _deadline(3))])
+
+        self.advance_to(4)
+        self.assertEqual(self.fired[-1], ("report", OVERDUE, _deadline(3)))
+        self.assertEqual(self.scheduler.pending(), 0)
+
+    def test_overdue_replaces_missed_upcoming(self):
+        self.project.add_task(Task("report", deadline=_deadline(3)))
+
+        self.advance_to(6)
+        self.assertEqual(self.fired, [("report", OVERDUE, _deadline(3))])
+
+    def test_update_deadline_reschedules_and_done_cancels(self):
+        task = Task("report", deadline=_deadline(3))
+        self.project.add_task(task)
+
+        task.update_deadline(_deadline(10))
+        self.assertEqual(self.scheduler.pending(), 2)
+        self.advance_to(5)
+        self.assertEqual(self.fired, [])
+
+        task.set_state(TaskState.DONE)
+        self.assertEqual(self.scheduler.pending(), 0)
+
+        task.set_state(TaskState.TODO)
+        self.assertEqual(self.scheduler.pending(), 2)
+
+    def test_removing_project_cancels_its_reminders(self):
+        store = MemoryStore()
+        store.add_project(self.project)
+        self.project.add_task(Task("a", deadline=_deadline(3)))
+        self.project.add_task(Task("b", deadline=_deadline(4)))
+        self.assertEqual(self.scheduler.pending(), 4)
+
+        store.remove_project(self.project.id)
+        self.assertEqual(self.scheduler.pending(), 0)
+        self.advance_to(30)
+        self.assertEqual(self.fired, [])
+
+    def test_dead_entries_are_compacted(self):
+        tasks = [Task(f"t{i}", deadline=_deadline(3)) for i in range(100)]
+        for task in tasks:
+            self.project.add_task(task)
+        for task in tasks[:80]:
+            self.project.remove_task(task.id)
+
+        # Without compaction all 200 entries would still be in the heap.
+        self.assertEqual(self.scheduler.pending(), 40)
+        self.assertLess(self.scheduler.heap_size(), 2 * 40 + 64)
+
+    def test_failing_callback_does_not_stop_later_reminders(self):
+        calls = []
+
+        def callback(task, kind, deadline):
+            calls.append(task.name)
+            if task.name == "bad":
+                raise TypeError("boom")
+
+        scheduler = ReminderScheduler(callback, lead=timedelta(hours=24), now=lambda: TODAY + timedelta(days=30))
+        scheduler.schedule(Task("bad", deadline=_deadline(1)))
+        scheduler.schedule(Task("good", deadline=_deadline(2)))
+
+        with self.assertLogs("reminders", "ERROR"):
+            self.assertEqual(scheduler.run_pending(), 2)
+        self.assertEqual(calls, ["bad", "good"])
+
+
+class BackgroundThreadTest(unittest.TestCase):
+    def test_thread_survives_a_failing_callback(self):
+        done = threading.Event()
+        calls = []
+
+        def callback(task, kind, deadline):
+            calls.append(task.name)
+            if len(calls) == 2:
+                done.set()
+            raise RuntimeError("boom")
+
+        scheduler = ReminderScheduler(callback, lead=timedelta(hours=24), now=lambda: TODAY + timedelta(days=30))
+        scheduler.start()
+        try:
+            with self.assertLogs("reminders", "ERROR"):
+                scheduler.schedule(Task("first", deadline=_deadline(1)))
+                scheduler.schedule(Task("second", deadline=_deadline(2)))
+                self.assertTrue(done.wait(5))
+            self.assertTrue(scheduler.is_running())
+            self.assertEqual(scheduler.pending(), 0)
+        finally:
+            scheduler.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
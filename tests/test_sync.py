@@ -0,0 +1,197 @@
+import json
+import socket
+import subprocess
+import sys
+import textwrap
+import threading
+import unittest
+from pathlib import Path
+
+from memory import MemoryStore
+from project import Project
+from sync import Replica, SyncError, project_digest, serve, sync_with
+from task import Task
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in a separate process: creates a clashing "Work" project, syncs, edits
+# task "a" and deletes task "b", waits for the server's edits, then syncs again.
+PEER = textwrap.dedent("""
+    import json, sys
+    from memory import MemoryStore
+    from project import Project
+    from sync import Replica, sync_with
+
+    port = int(sys.argv[1])
+    store = MemoryStore()
+    replica = Replica(store)
+
+    def sync():
+        sent, received, _ = sync_with(replica, "127.0.0.1", port)
+        return sent + received
+
+    store.add_project(Project("Work", "client copy"))
+    first = sync()
+
+    project = next(p for p in store.list_projects() if p.description == "server copy")
+    tasks = {t.name: t for t in project.tasks}
+    tasks["a"].description = "client"
+    project.remove_task(tasks["b"].id)
+    print(json.dumps({"bytes": first}), flush=True)
+
+    sys.stdin.readline()
+    second = sync()
+    state = {p.name: [p.description, sorted([t.name, t.description] for t in p.tasks)] for p in store.list_projects()}
+    print(json.dumps({"bytes": second, "state": state}), flush=True)
+""")
+
+
+def _state(store):
+    return {p.name: [p.description, sorted([t.name, t.description] for t in p.tasks)] for p in store.list_projects()}
+
+
+class TwoProcessSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryStore()
+        self.project = Project("Work", "server copy")
+        self.store.add_project(self.project)
+        for name in ("a", "b"):
+            self.project.add_task(Task(name, "original"))
+        for i in range(500):
+            self.project.add_task(Task(f"filler {i}", "x" * 50))
+
+        self.server = serve(Replica(self.store), "127.0.0.1", 0)
+        self.port = self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_conflicts_converge_and_second_sync_is_a_small_delta(self):
+        peer = subprocess.Popen(
+            [sys.executable, "-c", PEER, str(self.port)],
+            cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+        )
+        try:
+            first = json.loads(peer.stdout.readline())
+
+            tasks = {t.name: t for t in self.project.tasks}
+            tasks["a"].description = "server"
+            tasks["b"].name = "b edited"
+
+            peer.stdin.write("\n")
+            peer.stdin.flush()
+            second = json.loads(peer.stdout.readline())
+        finally:
+            peer.stdin.close()
+            peer.wait(timeout=30)
+
+        server_state = _state(self.store)
+        self.assertEqual(second["state"], server_state)
+        self.assertEqual(set(server_state), {"Work", "Work (2)"})
+
+        tasks = dict(server_state[self.project.name][1])
+        self.assertIn(tasks["a"], ("client", "server"))
+        self.assertNotIn("b", tasks)
+        self.assertNotIn("b edited", tasks)
+
+        self.assertGreater(first["bytes"], 50_000)
+        self.assertLess(second["bytes"], 4096)
+
+
+class ApplyValidationTest(unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryStore()
+        self.project = Project("Work")
+        self.store.add_project(self.project)
+        self.project.add_task(Task("a"))
+        self.replica = Replica(self.store)
+
+    def assertRejected(self, delta):
+        before = (_state(self.store), project_digest(self.project), dict(self.store.removed_projects))
+        with self.assertRaises(SyncError):
+            self.replica.apply(delta)
+        self.assertEqual((_state(self.store), project_digest(self.project), dict(self.store.removed_projects)), before)
+        # The store must still be usable for later syncs.
+        self.replica.delta_for({"vv": {}, "digests": {}})
+
+    def _project_entry(self, **overrides):
+        entry = {"id": self.project.id, "created_at": self.project.created_at, "fields": {}, "tasks": [], "removed_tasks": {}}
+        entry.update(overrides)
+        return entry
+
+    def test_rejects_unversioned_field(self):
+        self.assertRejected({"projects": [self._project_entry(fields={"tasks": ["oops", 4, "x"]})]})
+
+    def test_rejects_invalid_values(self):
+        for fields in (
+            {"name": [42, 9, "x"]},
+            {"name": ["   ", 9, "x"]},
+            {"name": ["x" * 1000, 9, "x"]},
+            {"description": [["list"], 9, "x"]},
+        ):
+            with self.subTest(fields=fields):
+                self.assertRejected({"projects": [self._project_entry(fields=fields)]})
+
+        task_entry = {"id": self.project.tasks[0].id, "created_at": "now", "fields": {"state": ["LATER", 9, "x"]}}
+        self.assertRejected({"projects": [self._project_entry(tasks=[task_entry])]})
+
+    def test_later_error_leaves_earlier_entries_unapplied(self):
+        good = {"id": "new", "created_at": "now", "fields": {"name": ["Other", 9, "x"]}}
+        bad = self._project_entry(fields={"name": ["ok", "nine", "x"]})
+        self.assertRejected({"removed_projects": {self.project.id: [9, "x"]}, "projects": [good, bad]})
+
+    def test_rejects_new_objects_without_a_name(self):
+        self.assertRejected({"projects": [{"id": "new", "created_at": "now", "fields": {}}]})
+        task_entry = {"id": "new task", "created_at": "now", "fields": {"description": ["d", 9, "x"]}}
+        self.assertRejected({"projects": [self._project_entry(tasks=[task_entry])]})
+
+    def test_removing_unknown_project_records_no_tombstone(self):
+        self.assertFalse(self.store.remove_project("nope"))
+        self.assertEqual(self.store.removed_projects, {})
+
+        self.assertFalse(self.store.remove_project("gone", stamp=(3, "peer")))
+        self.assertEqual(self.store.removed_projects, {"gone": (3, "peer")})
+
+
+class MalformedPeerTest(unittest.TestCase):
+    def setUp(self):
+        self.server = serve(Replica(MemoryStore()), "127.0.0.1", 0)
+        self.port = self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_server_replies_with_error(self):
+        with socket.create_connection(("127.0.0.1", self.port), timeout=5) as sock, sock.makefile("rwb") as f:
+            f.write(b'{"no summary": true}\n')
+            f.flush()
+            reply = json.loads(f.readline())
+        self.assertIs(reply["ok"], False)
+        self.assertIn("summary", reply["error"])
+
+    def test_rejection_from_peer_raises_sync_error(self):
+        listener = socket.create_server(("127.0.0.1", 0))
+
+        def reject():
+            conn, _ = listener.accept()
+            with conn, conn.makefile("rwb") as f:
+                f.readline()
+                f.write(b'{"ok":false,"error":"boom"}\n')
+                f.flush()
+
+        threading.Thread(target=reject, daemon=True).start()
+        with listener, self.assertRaisesRegex(SyncError, "boom"):
+            sync_with(Replica(MemoryStore()), "127.0.0.1", listener.getsockname()[1], timeout=5)
+
+    def test_unreachable_peer_raises_sync_error(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        with self.assertRaises(SyncError):
+            sync_with(Replica(MemoryStore()), "127.0.0.1", port, timeout=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import config
+
+# A stamp orders edits across replicas: higher counter wins, ties are broken
+# by replica id so every replica picks the same winner.
+Stamp = Tuple[int, str]
+
+_MISSING = object()
+
+
+class LamportClock:
+    def __init__(self, replica_id: Optional[str] = None) -> None:
+        self._replica_id = replica_id
+        self.counter = 0
+        self._lock = threading.Lock()
+
+    @property
+    def replica_id(self) -> str:
+        # Resolved on first use so importing this module does not read config.
+        if self._replica_id is None:
+            import uuid
+
+            self._replica_id = config.REPLICA_ID or uuid.uuid4().hex[:12]
+        return self._replica_id
+
+    def tick(self) -> Stamp:
+        with self._lock:
+            self.counter += 1
+            counter = self.counter
+        return counter, self.replica_id
+
+    def observe(self, counter: int) -> None:
+        with self._lock:
+            if counter > self.counter:
+                self.counter = counter
+
+
+CLOCK = LamportClock()
+
+# Guards projects and tasks against concurrent changes from sync sessions and
+# the interactive menu.
+MODEL_LOCK = threading.RLock()
+
+# Listeners are called as listener(obj, event, value), where event is the name
+# of a versioned field that changed or a membership event such as "task_added".
+Listener = Callable[[Any, str, Any], None]
+_listeners: List[Listener] = []
+
+def subscribe(listener: Listener) -> None:
+    _listeners.append(listener)
+
+def unsubscribe(listener: Listener) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+def notify(obj: Any, event: str, value: Any) -> None:
+    for listener in list(_listeners):
+        listener(obj, event, value)
+
+def item_hash(*parts: Any) -> int:
+    """64-bit hash of one digest item; items are combined with XOR."""
+    import hashlib
+
+    data = "\0".join(map(str, parts)).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+class Versioned:
+    """Stamps every change to a versioned field and notifies listeners of it.
+
+    Each object also keeps a digest: the XOR of a hash per stamped field and
+    per attached child (see attach()). Replacing a stamp or changing a child
+    updates the digest, and every parent above it, in O(1) per level.
+    """
+
+    _versioned_fields: Tuple[str, ...] = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Re-assigning the current value is not an edit and must not win a conflict.
+        changed = self.__dict__.get(name, _MISSING) != value
+        object.__setattr__(self, name, value)
+        if changed and name in self._versioned_fields:
+            self._restamp(name, CLOCK.tick())
+            notify(self, name, value)
+
+    def set_stamped(self, name: str, value: Any, stamp: Stamp) -> None:
+        object.__setattr__(self, name, value)
+        self._restamp(name, stamp)
+        notify(self, name, value)
+
+    def stamps(self) -> Dict[str, Stamp]:
+        return dict(self.__dict__.get("_stamps", {}))
+
+    def digest(self) -> int:
+        return self.__dict__.get("_digest", 0)
+
+    def attach(self, child: Versioned) -> None:
+        object.__setattr__(child, "_parent", self)
+        self.xor_digest(item_hash(child.id, child.digest()))
+
+    def detach(self, child: Versioned) -> None:
+        object.__setattr__(child, "_parent", None)
+        self.xor_digest(item_hash(child.id, child.digest()))
+
+    def xor_digest(self, delta: int) -> None:
+        old = self.digest()
+        new = old ^ delta
+        object.__setattr__(self, "_digest", new)
+
+        parent = self.__dict__.get("_parent")
+        if parent is not None:
+            parent.xor_digest(item_hash(self.id, old) ^ item_hash(self.id, new))
+
+    def _restamp(self, name: str, stamp: Stamp) -> None:
+        stamps = self.__dict__.setdefault("_stamps", {})
+        old = stamps.get(name)
+        stamps[name] = stamp
+
+        delta = item_hash(name, *stamp)
+        if old is not None:
+            delta ^= item_hash(name, *old)
+        self.xor_digest(delta)